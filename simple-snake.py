@@ -1,17 +1,33 @@
+import time
+STARTUP_START = time.perf_counter()
+
 import pygame
-import random
+import argparse
+import atexit
 import os
 import json
+import random
+import threading
+from collections import OrderedDict
+
+from snake_engine import SnakeEngine, speed_to_fps, EVENT_HEAD, EVENT_TAIL, EVENT_EAT, EVENT_FOOD, EVENT_DEATH, EVENT_WIN
+from snake_scores import MAX_NAME_LENGTH, HighScoreStore, atomic_write_text
+from snake_replay import REPLAY_FILE, Replay, ReplayPlayer, ReplayRecorder
+from snake_profiler import FrameProfiler
+from snake_autopilot import Autopilot
 
 DEFAULT_SCREEN_WIDTH = 640
 DEFAULT_SCREEN_HEIGHT = 480
 GRID_SIZE = 20
 
 FONT_NAME = "arial"
-HIGHSCORE_FILE = "highscores.txt"
 SETTINGS_FILE = "settings.json"
-MAX_NAME_LENGTH = 10
-MAX_HIGHSCORES = 10
+FONT_CACHE_FILE = os.path.join(os.path.dirname(SETTINGS_FILE), "font_cache.json")
+SETTINGS_SAVE_DELAY = 1.0
+LABEL_CACHE_SIZE = 256
+RENDER_FPS = 60
+MAX_TICKS_PER_FRAME = 5
+ATTRACT_DELAY = 15.0
 
 BACKGROUND_COLOR = (20, 20, 20)
 SNAKE_COLOR = (40, 200, 40)
@@ -21,6 +37,10 @@ TEXT_COLOR = (230, 230, 230)
 ACCENT_COLOR = (100, 180, 255)
 MENU_SELECT_COLOR = (255, 215, 0)
 DIM_TEXT_COLOR = (180, 180, 180)
+WALL_COLOR = (8, 8, 8)
+PROFILER_BOX_COLOR = (0, 0, 0)
+PROFILER_FONT_SIZE = 14
+PROFILER_WIDEST_LINE = "p50/95/99 000.0/000.0/000.0 ms"
 
 MIN_WINDOW_WIDTH = DEFAULT_SCREEN_WIDTH
 MIN_WINDOW_HEIGHT = DEFAULT_SCREEN_HEIGHT
@@ -32,34 +52,6 @@ STATE_GAMEOVER = "gameover"
 STATE_HIGHSCORES = "highscores"
 STATE_NAMEENTRY = "nameentry"
 
-def load_highscores():
-    scores = []
-    if os.path.exists(HIGHSCORE_FILE):
-        with open(HIGHSCORE_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                parts = line.split(",", 1)
-                if len(parts) == 2:
-                    name, score_str = parts
-                    try:
-                        score = int(score_str)
-                        scores.append((name, score))
-                    except ValueError:
-                        pass
-    scores.sort(key=lambda s: s[1], reverse=True)
-    return scores[:MAX_HIGHSCORES]
-
-def save_highscore(name, score):
-    scores = load_highscores()
-    scores.append((name, score))
-    scores.sort(key=lambda s: s[1], reverse=True)
-    scores = scores[:MAX_HIGHSCORES]
-    with open(HIGHSCORE_FILE, "w", encoding="utf-8") as f:
-        for n, s in scores:
-            f.write(f"{n},{s}\n")
-
 def load_settings():
     defaults = {
         "speed_level": 5,
@@ -87,14 +79,135 @@ def load_settings():
 
 def save_settings(settings):
     try:
-        with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-            json.dump(settings, f, indent=2)
+        atomic_write_text(SETTINGS_FILE, json.dumps(settings, indent=2))
+    except Exception:
+        pass
+
+class SettingsManager(dict):
+    def __init__(self, delay=SETTINGS_SAVE_DELAY):
+        super().__init__(load_settings())
+        self.delay = delay
+        self.dirty_at = None
+        self.closed = False
+        self.cond = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.worker, name="settings-writer", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def save(self):
+        with self.cond:
+            self.dirty_at = time.monotonic()
+            self.cond.notify()
+
+    def take_pending(self):
+        self.dirty_at = None
+        return dict(self)
+
+    def write(self, settings):
+        with self.write_lock:
+            save_settings(settings)
+
+    def worker(self):
+        while True:
+            with self.cond:
+                while not self.closed:
+                    if self.dirty_at is None:
+                        self.cond.wait()
+                        continue
+                    remaining = self.dirty_at + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                if self.closed:
+                    return
+                settings = self.take_pending()
+            self.write(settings)
+
+    def flush(self):
+        with self.cond:
+            if self.dirty_at is None:
+                return
+            settings = self.take_pending()
+        self.write(settings)
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join()
+        self.flush()
+
+_fonts = {}
+_font_paths = None
+_labels = OrderedDict()
+label_cache_stats = {"hits": 0, "misses": 0}
+font_cache_stats = {"hits": 0, "misses": 0}
+
+def load_font_cache():
+    if os.path.exists(FONT_CACHE_FILE):
+        try:
+            with open(FONT_CACHE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+        except Exception:
+            pass
+    return {}
+
+def resolve_font(name, bold):
+    global _font_paths
+    if _font_paths is None:
+        _font_paths = load_font_cache()
+    key = f"{name}:{'bold' if bold else 'regular'}"
+    entry = _font_paths.get(key)
+    if isinstance(entry, list) and len(entry) == 2 and (entry[0] is None or os.path.exists(entry[0])):
+        font_cache_stats["hits"] += 1
+        return entry
+    font_cache_stats["misses"] += 1
+    resolved = []
+
+    def capture(path, size, set_bold, set_italic):
+        resolved.extend((path, set_bold))
+        return None
+
+    pygame.font.SysFont(name, 1, bold=bold, constructor=capture)
+    _font_paths[key] = resolved
+    try:
+        atomic_write_text(FONT_CACHE_FILE, json.dumps(_font_paths, indent=2))
     except Exception:
         pass
+    return resolved
+
+def get_font(size, bold=False, name=FONT_NAME):
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        path, set_bold = resolve_font(name, bold)
+        try:
+            font = pygame.font.Font(path, size)
+        except Exception:
+            font = pygame.font.Font(None, size)
+        font.set_bold(set_bold)
+        _fonts[key] = font
+    return font
+
+def render_label(text, size, color, bold=False):
+    key = (text, size, tuple(color), bold)
+    label = _labels.get(key)
+    if label is not None:
+        _labels.move_to_end(key)
+        label_cache_stats["hits"] += 1
+        return label
+    label_cache_stats["misses"] += 1
+    label = get_font(size, bold).render(text, True, color)
+    _labels[key] = label
+    if len(_labels) > LABEL_CACHE_SIZE:
+        _labels.popitem(last=False)
+    return label
 
 def draw_text(surface, text, size, color, x, y, center=False, bold=False):
-    font = pygame.font.SysFont(FONT_NAME, size, bold=bold)
-    label = font.render(text, True, color)
+    label = render_label(text, size, color, bold)
     rect = label.get_rect()
     if center:
         rect.center = (x, y)
@@ -102,18 +215,21 @@ def draw_text(surface, text, size, color, x, y, center=False, bold=False):
         rect.topleft = (x, y)
     surface.blit(label, rect)
 
-def speed_to_fps(speed_level):
-    return int(6 + (speed_level - 1) * (16 / 9))
-
-def clamp_name_to_letters(name):
-    return "".join([ch for ch in name if ch.isalpha()])[:MAX_NAME_LENGTH]
+def write_replay(replay, path):
+    try:
+        replay.save(path)
+    except Exception:
+        pass
 
 class SnakeGame:
     def __init__(self):
-        pygame.init()
+        self.startup_marks = [("import", time.perf_counter())]
+        pygame.display.init()
+        pygame.font.init()
         pygame.display.set_caption("Snake")
+        self.startup_marks.append(("init", time.perf_counter()))
 
-        self.settings = load_settings()
+        self.settings = SettingsManager()
         self.speed_level = self.settings.get("speed_level", 5)
         self.fullscreen = self.settings.get("fullscreen", False)
         self.prev_window_size = tuple(self.settings.get("window_size", [DEFAULT_SCREEN_WIDTH, DEFAULT_SCREEN_HEIGHT]))
@@ -127,18 +243,46 @@ class SnakeGame:
 
         self.screen = pygame.display.set_mode((width, height), flags)
         self.screen_width, self.screen_height = self.screen.get_size()
+        self.startup_marks.append(("window", time.perf_counter()))
         self.grid_size = GRID_SIZE
-        self.grid_width = self.screen_width // self.grid_size
-        self.grid_height = self.screen_height // self.grid_size
+        self.board_size = None
+        self.live_board_size = None
+        self.camera = (0, 0)
+        self.grid_width, self.grid_height = self.board_dims()
+        self.background = None
+        self.background_key = None
+        self.tiles = None
+        self.tiles_key = None
+        self.dirty_rendering = True
+        self.full_redraw = True
+        self.dirty_cells = []
+        self.update_rects = None
+        self.hud_rects = []
+        self.rendered_state = None
+        self.rendered_score = None
 
         self.clock = pygame.time.Clock()
         self.fps = speed_to_fps(self.speed_level)
+        self.render_fps = RENDER_FPS
+        self.tick_accumulator = 0.0
+        self.interpolate = False
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.profiler_rect = None
 
         self.state = STATE_MENU
         self.menu_index = 0
+        self.autopilot = Autopilot()
+        self.autopilot_enabled = False
+        self.demo = False
+        self.idle_time = 0.0
 
-        self.highscores = load_highscores()
+        self.score_store = HighScoreStore()
+        self.highscores = self.score_store.leaderboard()
 
+        self.engine = SnakeEngine(self.grid_width, self.grid_height)
+        self.replay_player = None
+        self.replay_writer = None
         self.reset_game()
 
         self.entered_name = ""
@@ -147,12 +291,49 @@ class SnakeGame:
         self.gameover_index = 0
 
         self.snd_eat = None
-        try:
-            pygame.mixer.init()
-        except Exception:
-            pass
+        self.audio_ready = None
+        self.startup_profile = False
 
         self.update_menu_labels()
+        self.startup_marks.append(("state", time.perf_counter()))
+
+    def quit_game(self):
+        self.settings["speed_level"] = self.speed_level
+        if not self.fullscreen:
+            self.settings["window_size"] = [self.screen_width, self.screen_height]
+        self.settings.save()
+        self.settings.close()
+        self.profiler.close()
+        pygame.quit()
+        raise SystemExit
+
+    def init_audio(self):
+        if self.audio_ready is None:
+            try:
+                pygame.mixer.init()
+                self.audio_ready = True
+            except Exception:
+                self.audio_ready = False
+        return self.audio_ready
+
+    def play_sound(self, sound):
+        if sound is not None and self.init_audio():
+            try:
+                sound.play()
+            except Exception:
+                pass
+
+    def report_startup(self):
+        self.startup_profile = False
+        self.startup_marks.append(("first_frame", time.perf_counter()))
+        report = {}
+        last = STARTUP_START
+        for phase, mark in self.startup_marks:
+            report[f"{phase}_ms"] = round((mark - last) * 1000.0, 2)
+            last = mark
+        report["total_ms"] = round((last - STARTUP_START) * 1000.0, 2)
+        report["font_cache"] = dict(font_cache_stats)
+        print(json.dumps(report))
 
     def update_menu_labels(self):
         fs_label = "Fullscreen: On" if self.fullscreen else "Fullscreen: Off"
@@ -173,55 +354,226 @@ class SnakeGame:
 
         self.screen = pygame.display.get_surface()
         self.screen_width, self.screen_height = self.screen.get_size()
-        self.grid_width = self.screen_width // self.grid_size
-        self.grid_height = self.screen_height // self.grid_size
+        self.grid_width, self.grid_height = self.board_dims()
+        self.invalidate_background()
 
         self.settings["fullscreen"] = self.fullscreen
         self.settings["window_size"] = [self.screen_width, self.screen_height]
-        save_settings(self.settings)
+        self.settings.save()
         self.update_menu_labels()
 
+    @property
+    def snake(self):
+        return self.engine.snake
+
+    @property
+    def food(self):
+        return self.engine.food
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def direction(self):
+        return self.engine.direction
+
+    @property
+    def won(self):
+        return self.engine.won
+
+    def resize_window(self, width, height):
+        new_w = max(MIN_WINDOW_WIDTH, width)
+        new_h = max(MIN_WINDOW_HEIGHT, height)
+        pygame.display.set_mode((new_w, new_h), pygame.RESIZABLE)
+        self.screen = pygame.display.get_surface()
+        self.screen_width, self.screen_height = self.screen.get_size()
+        self.grid_width, self.grid_height = self.board_dims()
+        self.invalidate_background()
+
+    def board_dims(self):
+        if self.board_size:
+            return self.board_size
+        return max(1, self.screen_width // self.grid_size), max(1, self.screen_height // self.grid_size)
+
+    def viewport(self):
+        return -(-self.screen_width // self.grid_size), -(-self.screen_height // self.grid_size)
+
+    def update_camera(self):
+        view_w, view_h = self.viewport()
+        head_x, head_y = self.snake[0]
+        camera = (
+            max(0, min(head_x - view_w // 2, self.grid_width - view_w)),
+            max(0, min(head_y - view_h // 2, self.grid_height - view_h)),
+        )
+        if camera != self.camera:
+            self.camera = camera
+            self.full_redraw = True
+
     def reset_game(self):
-        self.grid_width = max(1, self.screen_width // self.grid_size)
-        self.grid_height = max(1, self.screen_height // self.grid_size)
-        self.snake = [(self.grid_width // 2, self.grid_height // 2)]
-        self.direction = (1, 0)
+        self.grid_width, self.grid_height = self.board_dims()
+        seed = random.getrandbits(64)
+        self.engine.reset(self.grid_width, self.grid_height, seed=seed)
+        self.recorder = ReplayRecorder(self.engine, seed, self.speed_level)
+        self.replay_player = None
+        self.fps = speed_to_fps(self.speed_level)
+        self.pending_direction = self.direction
+        self.prev_head = None
+        self.last_tail = None
+        self.full_redraw = True
+
+    def start_replay(self, path, seek=0):
+        self.wait_replay_writer()
+        replay = Replay.load(path)
+        if self.replay_player is None:
+            self.live_board_size = self.board_size
+        self.replay_player = ReplayPlayer(replay, self.engine)
+        self.replay_player.seek(seek)
+        self.sync_replay_board()
+        self.fps = speed_to_fps(replay.speed_level)
         self.pending_direction = self.direction
-        self.food = self.random_food_position(self.snake)
-        self.score = 0
-        self.grow = 0
+        self.prev_head = None
+        self.last_tail = None
+        self.full_redraw = True
+        self.state = STATE_GAME
 
-    def random_food_position(self, snake):
-        if self.grid_width <= 0 or self.grid_height <= 0:
-            return (0, 0)
-        while True:
-            pos = (random.randint(0, self.grid_width - 1), random.randint(0, self.grid_height - 1))
-            if pos not in snake:
-                return pos
+    def autopilot_active(self):
+        return (self.demo or self.autopilot_enabled) and Autopilot.supports(self.grid_width, self.grid_height)
+
+    def start_demo(self):
+        self.idle_time = 0.0
+        if not Autopilot.supports(*self.board_dims()):
+            return
+        self.reset_game()
+        self.demo = True
+        self.state = STATE_GAME
+
+    def stop_demo(self):
+        self.demo = False
+        self.idle_time = 0.0
+        self.state = STATE_MENU
+
+    def sync_replay_board(self):
+        self.board_size = (self.engine.width, self.engine.height)
+        if (self.grid_width, self.grid_height) != self.board_size:
+            self.grid_width, self.grid_height = self.board_size
+            self.full_redraw = True
+
+    def stop_replay(self):
+        self.replay_player = None
+        self.board_size = self.live_board_size
+        self.grid_width, self.grid_height = self.board_dims()
+        self.full_redraw = True
+        self.fps = speed_to_fps(self.speed_level)
+        self.state = STATE_MENU
+
+    def save_replay(self):
+        self.wait_replay_writer()
+        replay = self.recorder.finish(self.engine)
+        self.replay_writer = threading.Thread(target=write_replay, args=(replay, REPLAY_FILE), name="replay-writer")
+        self.replay_writer.start()
 
-    def draw_grid(self):
+    def wait_replay_writer(self):
+        if self.replay_writer is not None:
+            self.replay_writer.join()
+            self.replay_writer = None
+
+    def draw_grid(self, surface):
         for x in range(0, self.screen_width, self.grid_size):
-            pygame.draw.line(self.screen, (30, 30, 30), (x, 0), (x, self.screen_height))
+            pygame.draw.line(surface, (30, 30, 30), (x, 0), (x, self.screen_height))
         for y in range(0, self.screen_height, self.grid_size):
-            pygame.draw.line(self.screen, (30, 30, 30), (0, y), (self.screen_width, y))
-
-    def draw_snake(self):
-        for i, (x, y) in enumerate(self.snake):
-            rect = pygame.Rect(x * self.grid_size, y * self.grid_size, self.grid_size, self.grid_size)
-            color = SNAKE_HEAD_COLOR if i == 0 else SNAKE_COLOR
-            pygame.draw.rect(self.screen, color, rect)
-            pygame.draw.rect(self.screen, BACKGROUND_COLOR, rect, 1)
+            pygame.draw.line(surface, (30, 30, 30), (0, y), (self.screen_width, y))
+
+    def get_background(self):
+        key = (self.screen_width, self.screen_height, self.grid_size)
+        if self.background is None or self.background_key != key:
+            self.background = pygame.Surface((self.screen_width, self.screen_height)).convert()
+            self.background.fill(BACKGROUND_COLOR)
+            self.draw_grid(self.background)
+            self.background_key = key
+        return self.background
+
+    def invalidate_background(self):
+        self.background = None
+        self.full_redraw = True
+
+    def make_tile(self, color, border=True):
+        tile = pygame.Surface((self.grid_size, self.grid_size)).convert()
+        tile.fill(color)
+        if border:
+            pygame.draw.rect(tile, BACKGROUND_COLOR, tile.get_rect(), 1)
+        return tile
+
+    def get_tiles(self):
+        key = (self.grid_size, SNAKE_COLOR, SNAKE_HEAD_COLOR, FOOD_COLOR, BACKGROUND_COLOR)
+        if self.tiles is None or self.tiles_key != key:
+            self.tiles = {
+                "body": self.make_tile(SNAKE_COLOR),
+                "head": self.make_tile(SNAKE_HEAD_COLOR),
+                "food": self.make_tile(FOOD_COLOR, border=False),
+            }
+            self.tiles_key = key
+        return self.tiles
+
+    def cell_rect(self, pos):
+        return pygame.Rect((pos[0] - self.camera[0]) * self.grid_size, (pos[1] - self.camera[1]) * self.grid_size, self.grid_size, self.grid_size)
+
+    def draw_segment(self, pos, head=False):
+        self.screen.blit(self.get_tiles()["head" if head else "body"], self.cell_rect(pos))
+
+    def draw_board_edges(self):
+        right = (self.grid_width - self.camera[0]) * self.grid_size
+        bottom = (self.grid_height - self.camera[1]) * self.grid_size
+        if right < self.screen_width:
+            self.screen.fill(WALL_COLOR, (right, 0, self.screen_width - right, self.screen_height))
+        if bottom < self.screen_height:
+            self.screen.fill(WALL_COLOR, (0, bottom, self.screen_width, self.screen_height - bottom))
+
+    def draw_snake(self, with_head=True):
+        cam_x, cam_y = self.camera
+        view_w, view_h = self.viewport()
+        head = self.snake[0]
+        if len(self.snake) <= view_w * view_h:
+            cells = self.snake
+        else:
+            occupied = self.engine.snake_cells
+            cells = [(x, y) for y in range(cam_y, cam_y + view_h) for x in range(cam_x, cam_x + view_w) if (x, y) in occupied]
+        tiles = self.get_tiles()
+        body, head_tile = tiles["body"], tiles["head"]
+        size = self.grid_size
+        batch = []
+        for x, y in cells:
+            if not (cam_x <= x < cam_x + view_w and cam_y <= y < cam_y + view_h):
+                continue
+            if (x, y) != head:
+                batch.append((body, ((x - cam_x) * size, (y - cam_y) * size)))
+            elif with_head:
+                batch.append((head_tile, ((x - cam_x) * size, (y - cam_y) * size)))
+        self.screen.blits(batch, doreturn=False)
+
+    def lerp_rect(self, start, end, alpha):
+        x = start[0] + (end[0] - start[0]) * alpha
+        y = start[1] + (end[1] - start[1]) * alpha
+        return pygame.Rect(round((x - self.camera[0]) * self.grid_size), round((y - self.camera[1]) * self.grid_size), self.grid_size, self.grid_size)
+
+    def draw_snake_interpolated(self, alpha):
+        self.draw_snake(with_head=False)
+        tiles = self.get_tiles()
+        if self.last_tail is not None:
+            self.screen.blit(tiles["body"], self.lerp_rect(self.last_tail, self.snake[-1], alpha))
+        self.screen.blit(tiles["head"], self.lerp_rect(self.prev_head, self.snake[0], alpha))
 
     def draw_food(self):
-        x, y = self.food
-        rect = pygame.Rect(x * self.grid_size, y * self.grid_size, self.grid_size, self.grid_size)
-        pygame.draw.rect(self.screen, FOOD_COLOR, rect)
+        if self.food is None:
+            return
+        self.screen.blit(self.get_tiles()["food"], self.cell_rect(self.food))
 
     def draw_hud(self):
-        draw_text(self.screen, f"Score: {self.score}", 20, TEXT_COLOR, 10, 10)
-        font = pygame.font.SysFont(FONT_NAME, 20)
-        label = font.render(f"Speed: {self.speed_level}", True, TEXT_COLOR)
-        self.screen.blit(label, (self.screen_width - 10 - label.get_width(), 10))
+        score_label = render_label(f"Score: {self.score}", 20, TEXT_COLOR)
+        speed_label = render_label(f"Speed: {self.speed_level}", 20, TEXT_COLOR)
+        score_rect = self.screen.blit(score_label, (10, 10))
+        speed_rect = self.screen.blit(speed_label, (self.screen_width - 10 - speed_label.get_width(), 10))
+        self.hud_rects = [score_rect, speed_rect]
 
     def handle_menu_events(self, event):
         if event.type == pygame.KEYDOWN:
@@ -239,22 +591,12 @@ class SnakeGame:
                 elif choice == "Adjust Snake Speed":
                     self.state = STATE_SPEED
                 elif choice == "High Scores":
-                    self.highscores = load_highscores()
+                    self.highscores = self.score_store.leaderboard()
                     self.state = STATE_HIGHSCORES
                 elif choice == "Quit":
-                    self.settings["speed_level"] = self.speed_level
-                    if not self.fullscreen:
-                        self.settings["window_size"] = [self.screen_width, self.screen_height]
-                    save_settings(self.settings)
-                    pygame.quit()
-                    raise SystemExit
+                    self.quit_game()
             elif event.key == pygame.K_ESCAPE:
-                self.settings["speed_level"] = self.speed_level
-                if not self.fullscreen:
-                    self.settings["window_size"] = [self.screen_width, self.screen_height]
-                save_settings(self.settings)
-                pygame.quit()
-                raise SystemExit
+                self.quit_game()
 
     def render_menu(self):
         self.update_menu_labels()
@@ -273,12 +615,12 @@ class SnakeGame:
                 self.speed_level = max(1, self.speed_level - 1)
                 self.fps = speed_to_fps(self.speed_level)
                 self.settings["speed_level"] = self.speed_level
-                save_settings(self.settings)
+                self.settings.save()
             elif event.key == pygame.K_RIGHT:
                 self.speed_level = min(10, self.speed_level + 1)
                 self.fps = speed_to_fps(self.speed_level)
                 self.settings["speed_level"] = self.speed_level
-                save_settings(self.settings)
+                self.settings.save()
             elif event.key == pygame.K_ESCAPE:
                 self.state = STATE_MENU
             elif event.key == pygame.K_RETURN:
@@ -309,6 +651,14 @@ class SnakeGame:
         draw_text(self.screen, "press [esc] key to return", 18, DIM_TEXT_COLOR, self.screen_width // 2, self.screen_height - 40, center=True)
 
     def handle_game_events(self, event):
+        if self.replay_player:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.stop_replay()
+            return
+        if self.demo:
+            if event.type == pygame.KEYDOWN:
+                self.stop_demo()
+            return
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP and self.direction != (0, 1):
                 self.pending_direction = (0, -1)
@@ -322,44 +672,82 @@ class SnakeGame:
                 self.state = STATE_MENU
 
     def update_game(self):
-        self.direction = self.pending_direction
-        head_x, head_y = self.snake[0]
-        new_head = (head_x + self.direction[0], head_y + self.direction[1])
-
-        self.grid_width = max(1, self.screen_width // self.grid_size)
-        self.grid_height = max(1, self.screen_height // self.grid_size)
+        prev_head = self.snake[0]
+        self.prev_head = prev_head
+        self.last_tail = None
+        if self.replay_player:
+            if self.replay_player.done:
+                self.stop_replay()
+                return
+            events = self.replay_player.step()
+            self.sync_replay_board()
+        else:
+            if self.autopilot_active():
+                self.pending_direction = self.autopilot.decide(self.engine)
+            self.grid_width, self.grid_height = self.board_dims()
+            self.engine.resize(self.grid_width, self.grid_height)
+            self.recorder.record(self.engine, self.pending_direction)
+            events = self.engine.step(self.pending_direction)
+        for kind, pos in events:
+            if kind == EVENT_HEAD:
+                self.dirty_cells.append(pos)
+                self.dirty_cells.append(prev_head)
+            elif kind == EVENT_TAIL:
+                self.dirty_cells.append(pos)
+                self.last_tail = pos
+            elif kind == EVENT_FOOD:
+                self.dirty_cells.append(pos)
+            elif kind == EVENT_EAT:
+                self.play_sound(self.snd_eat)
+            elif kind in (EVENT_DEATH, EVENT_WIN):
+                if self.replay_player:
+                    self.stop_replay()
+                    return
+                if self.demo:
+                    self.stop_demo()
+                    return
+                self.save_replay()
+                self.state = STATE_GAMEOVER
+                self.gameover_index = 0
 
-        if not (0 <= new_head[0] < self.grid_width and 0 <= new_head[1] < self.grid_height):
-            self.state = STATE_GAMEOVER
-            self.gameover_index = 0
+    def render_game(self):
+        self.update_camera()
+        if self.interpolate:
+            self.render_game_full(min(1.0, self.tick_accumulator * self.fps))
             return
-
-        if new_head in self.snake:
-            self.state = STATE_GAMEOVER
-            self.gameover_index = 0
+        if not self.dirty_rendering or self.full_redraw or self.rendered_score != self.score:
+            self.render_game_full()
             return
-
-        self.snake.insert(0, new_head)
-        if new_head == self.food:
-            self.score += 10
-            self.grow += 1
-            self.food = self.random_food_position(self.snake)
-            if self.snd_eat:
-                try:
-                    self.snd_eat.play()
-                except Exception:
-                    pass
-        if self.grow > 0:
-            self.grow -= 1
+        background = self.get_background()
+        rects = [self.cell_rect(pos) for pos in self.dirty_cells]
+        if any(rect.collidelist(self.hud_rects) != -1 for rect in rects):
+            self.render_game_full()
+            return
+        for pos, rect in zip(self.dirty_cells, rects):
+            self.screen.blit(background, rect, rect)
+            if pos == self.snake[0]:
+                self.draw_segment(pos, head=True)
+            elif pos in self.engine.snake_cells:
+                self.draw_segment(pos)
+            elif pos == self.food:
+                self.draw_food()
+        self.dirty_cells = []
+        self.update_rects = rects
+
+    def render_game_full(self, alpha=None):
+        self.screen.blit(self.get_background(), (0, 0))
+        if self.board_size:
+            self.draw_board_edges()
+        if alpha is None or self.prev_head is None:
+            self.draw_snake()
         else:
-            self.snake.pop()
-
-    def render_game(self):
-        self.screen.fill(BACKGROUND_COLOR)
-        self.draw_grid()
-        self.draw_snake()
+            self.draw_snake_interpolated(alpha)
         self.draw_food()
         self.draw_hud()
+        self.dirty_cells = []
+        self.full_redraw = False
+        self.rendered_score = self.score
+        self.update_rects = None
 
     def handle_gameover_events(self, event):
         if event.type == pygame.KEYDOWN:
@@ -381,7 +769,8 @@ class SnakeGame:
 
     def render_gameover(self):
         self.screen.fill(BACKGROUND_COLOR)
-        draw_text(self.screen, "Game Over", 48, ACCENT_COLOR, self.screen_width // 2, 120, center=True, bold=True)
+        title = "You Win!" if self.won else "Game Over"
+        draw_text(self.screen, title, 48, ACCENT_COLOR, self.screen_width // 2, 120, center=True, bold=True)
         draw_text(self.screen, f"Score: {self.score}", 32, TEXT_COLOR, self.screen_width // 2, 180, center=True)
 
         for i, option in enumerate(self.gameover_options):
@@ -395,15 +784,15 @@ class SnakeGame:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN:
                 name = self.entered_name if self.entered_name else "Player"
-                save_highscore(name, self.score)
-                self.highscores = load_highscores()
+                self.score_store.insert(name, self.score)
+                self.highscores = self.score_store.leaderboard()
                 self.state = STATE_MENU
             elif event.key == pygame.K_BACKSPACE:
                 self.entered_name = self.entered_name[:-1]
             elif event.key == pygame.K_ESCAPE:
                 name = self.entered_name if self.entered_name else "Player"
-                save_highscore(name, self.score)
-                self.highscores = load_highscores()
+                self.score_store.insert(name, self.score)
+                self.highscores = self.score_store.leaderboard()
                 self.state = STATE_MENU
             else:
                 ch = event.unicode
@@ -418,28 +807,51 @@ class SnakeGame:
         draw_text(self.screen, display_name, 32, TEXT_COLOR, self.screen_width // 2, 230, center=True)
         draw_text(self.screen, "press [enter] key to save, press [esc] to cancel", 18, DIM_TEXT_COLOR, self.screen_width // 2, self.screen_height - 40, center=True)
 
+    def toggle_profiler(self):
+        self.show_profiler = not self.show_profiler
+        self.full_redraw = True
+
+    def draw_profiler(self):
+        stats = self.profiler.summary()
+        lines = [f"{phase:<9}{stats[phase]:6.2f} ms" for phase in ("events", "handlers", "update", "render", "present", "sleep")]
+        lines.append(f"p50/95/99 {stats['p50']:.1f}/{stats['p95']:.1f}/{stats['p99']:.1f} ms")
+        lines.append(f"length   {len(self.snake)}")
+        if self.state == STATE_GAME and self.autopilot_active():
+            pilot = self.autopilot.stats()
+            trailing = len(self.autopilot.decision_times)
+            lines.append(f"pilot    {pilot['decision_ms_mean']:.2f} ms, p99 {pilot['decision_ms_p99_trailing']:.2f} (last {trailing})")
+        font = get_font(PROFILER_FONT_SIZE)
+        labels = [font.render(line, True, TEXT_COLOR) for line in lines]
+        line_height = font.get_linesize()
+        width = max(font.size(PROFILER_WIDEST_LINE)[0], max(label.get_width() for label in labels)) + 12
+        rect = pygame.Rect(10, 36, width, line_height * len(labels) + 12)
+        pygame.draw.rect(self.screen, PROFILER_BOX_COLOR, rect)
+        for i, label in enumerate(labels):
+            self.screen.blit(label, (rect.x + 6, rect.y + 6 + i * line_height))
+        self.profiler_rect = rect
+        if self.update_rects is not None:
+            self.update_rects.append(rect)
+
     def run(self):
+        profiler = self.profiler
         while True:
+            profiler.begin_frame()
             self.update_menu_labels()
 
-            for event in pygame.event.get():
+            events = pygame.event.get()
+            profiler.lap("events")
+            for event in events:
                 if event.type == pygame.QUIT:
-                    self.settings["speed_level"] = self.speed_level
-                    if not self.fullscreen:
-                        self.settings["window_size"] = [self.screen_width, self.screen_height]
-                    save_settings(self.settings)
-                    pygame.quit()
-                    raise SystemExit
+                    self.quit_game()
+                if event.type == pygame.KEYDOWN:
+                    self.idle_time = 0.0
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.toggle_profiler()
+                    continue
                 if event.type == pygame.VIDEORESIZE and not self.fullscreen:
-                    new_w = max(MIN_WINDOW_WIDTH, event.w)
-                    new_h = max(MIN_WINDOW_HEIGHT, event.h)
-                    pygame.display.set_mode((new_w, new_h), pygame.RESIZABLE)
-                    self.screen = pygame.display.get_surface()
-                    self.screen_width, self.screen_height = self.screen.get_size()
-                    self.grid_width = max(1, self.screen_width // self.grid_size)
-                    self.grid_height = max(1, self.screen_height // self.grid_size)
+                    self.resize_window(event.w, event.h)
                     self.settings["window_size"] = [self.screen_width, self.screen_height]
-                    save_settings(self.settings)
+                    self.settings.save()
 
                 if self.state == STATE_MENU:
                     self.handle_menu_events(event)
@@ -453,10 +865,24 @@ class SnakeGame:
                     self.handle_gameover_events(event)
                 elif self.state == STATE_NAMEENTRY:
                     self.handle_nameentry_events(event)
+            profiler.lap("handlers")
 
-            if self.state == STATE_GAME:
+            ticks = 0
+            tick_time = 1.0 / self.fps
+            while self.state == STATE_GAME and self.tick_accumulator >= tick_time:
                 self.update_game()
-
+                self.tick_accumulator -= tick_time
+                ticks += 1
+                if ticks >= MAX_TICKS_PER_FRAME:
+                    self.tick_accumulator = 0.0
+                    break
+            profiler.lap("update")
+
+            if self.state != self.rendered_state:
+                self.full_redraw = True
+                self.rendered_state = self.state
+
+            rendered = self.state
             if self.state == STATE_MENU:
                 self.render_menu()
             elif self.state == STATE_SPEED:
@@ -469,9 +895,58 @@ class SnakeGame:
                 self.render_gameover()
             elif self.state == STATE_NAMEENTRY:
                 self.render_nameentry()
+            if self.show_profiler:
+                self.draw_profiler()
+            profiler.lap("render")
 
-            pygame.display.flip()
-            self.clock.tick(self.fps if self.state == STATE_GAME else 60)
+            if self.state == STATE_GAME and self.update_rects is not None:
+                pygame.display.update(self.update_rects)
+            else:
+                pygame.display.flip()
+            self.update_rects = None
+            profiler.lap("present")
+            if self.startup_profile:
+                self.report_startup()
+            frame_time = self.clock.tick(self.render_fps) / 1000.0
+            profiler.lap("sleep")
+            if self.state == STATE_GAME:
+                self.tick_accumulator += frame_time
+            else:
+                self.tick_accumulator = 0.0
+            if self.state == STATE_MENU:
+                self.idle_time += frame_time
+                if self.idle_time >= ATTRACT_DELAY:
+                    self.start_demo()
+            profiler.end_frame(rendered, f"render_{rendered}", ticks, len(self.snake))
 
 if __name__ == "__main__":
-    SnakeGame().run()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded game")
+    parser.add_argument("--seek", type=int, default=0, metavar="TICK", help="start the replay at this tick")
+    parser.add_argument("--render-fps", type=int, default=RENDER_FPS, metavar="N", help="frame rate cap, 0 for uncapped")
+    parser.add_argument("--interpolate", action="store_true", help="slide the snake smoothly between ticks")
+    parser.add_argument("--no-dirty-rects", action="store_true", help="redraw the whole board every frame")
+    parser.add_argument("--board", metavar="WxH", help="play on a fixed board of WxH cells with a scrolling camera")
+    parser.add_argument("--profile", action="store_true", help="show the frame-time overlay (toggle with F3)")
+    parser.add_argument("--profile-trace", metavar="FILE", help="write per-frame timings to FILE (.csv, otherwise JSON lines)")
+    parser.add_argument("--autopilot", action="store_true", help="let the pathfinding autopilot steer your games")
+    parser.add_argument("--startup-profile", action="store_true", help="print the time taken to reach the first frame")
+    args = parser.parse_args()
+    game = SnakeGame()
+    game.startup_profile = args.startup_profile
+    game.autopilot_enabled = args.autopilot
+    if args.board:
+        width, height = args.board.lower().split("x")
+        game.board_size = (max(1, int(width)), max(1, int(height)))
+        game.reset_game()
+    if args.autopilot and not Autopilot.supports(*game.board_dims()):
+        print("board too large for the autopilot; steering manually")
+    game.show_profiler = args.profile
+    if args.profile_trace:
+        game.profiler.open_trace(args.profile_trace)
+    game.render_fps = args.render_fps
+    game.interpolate = args.interpolate
+    game.dirty_rendering = not args.no_dirty_rects
+    if args.replay:
+        game.start_replay(args.replay, args.seek)
+    game.run()
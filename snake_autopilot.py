@@ -0,0 +1,291 @@
+import argparse
+import heapq
+import json
+import time
+from array import array
+from collections import deque
+
+from snake_engine import SnakeEngine, DIRECTIONS, speed_to_fps
+from snake_profiler import percentile
+
+UNREACHABLE = 1 << 30
+DECISION_WINDOW = 300
+REPAIR_FRACTION = 0.1
+AUTOPILOT_MAX_CELLS = 1 << 15
+SOAK_BOARD = (96, 54)
+SOAK_SPEED = 10
+SOAK_TICKS = 200000
+
+class Autopilot:
+    def __init__(self, window=DECISION_WINDOW, keep_history=False):
+        self.width = 0
+        self.height = 0
+        self.adjacent = []
+        self.dist = None
+        self.body = None
+        self.food = None
+        self.ticks = None
+        self.tail = None
+        self.decision_times = deque(maxlen=window)
+        self.history = array("d") if keep_history else None
+        self.decisions = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rebuilds = 0
+        self.repairs = 0
+        self.repairs_abandoned = 0
+
+    def __call__(self, engine, rng=None):
+        return self.decide(engine)
+
+    @staticmethod
+    def supports(width, height):
+        return width * height <= AUTOPILOT_MAX_CELLS
+
+    def build_adjacency(self, width, height):
+        self.width = width
+        self.height = height
+        adjacent = []
+        for y in range(height):
+            for x in range(width):
+                i = y * width + x
+                cells = []
+                if x > 0:
+                    cells.append(i - 1)
+                if x < width - 1:
+                    cells.append(i + 1)
+                if y > 0:
+                    cells.append(i - width)
+                if y < height - 1:
+                    cells.append(i + width)
+                adjacent.append(cells)
+        self.adjacent = adjacent
+
+    def rebuild(self, engine):
+        if (engine.width, engine.height) != (self.width, self.height):
+            self.build_adjacency(engine.width, engine.height)
+        width = self.width
+        self.food = engine.food
+        self.rebuilds += 1
+        body = bytearray(width * self.height)
+        for x, y in engine.snake:
+            body[y * width + x] = 1
+        self.body = body
+        dist = [UNREACHABLE] * (width * self.height)
+        self.dist = dist
+        if self.food is None:
+            return
+        adjacent = self.adjacent
+        start = self.food[1] * width + self.food[0]
+        dist[start] = 0
+        frontier = [start]
+        d = 0
+        while frontier:
+            d += 1
+            next_frontier = []
+            for i in frontier:
+                for j in adjacent[i]:
+                    if dist[j] > d and not body[j]:
+                        dist[j] = d
+                        next_frontier.append(j)
+            frontier = next_frontier
+
+    def relax(self, heap, budget):
+        dist = self.dist
+        body = self.body
+        adjacent = self.adjacent
+        while heap:
+            budget -= 1
+            if budget < 0:
+                return False
+            d, i = heapq.heappop(heap)
+            if d > dist[i]:
+                continue
+            d += 1
+            for j in adjacent[i]:
+                if dist[j] > d and not body[j]:
+                    dist[j] = d
+                    heapq.heappush(heap, (d, j))
+        return True
+
+    def block(self, i, budget):
+        dist = self.dist
+        body = self.body
+        adjacent = self.adjacent
+        body[i] = 1
+        old = dist[i]
+        if old >= UNREACHABLE:
+            return True
+        dist[i] = UNREACHABLE
+        affected = []
+        queue = deque([(i, old)])
+        while queue:
+            u, du = queue.popleft()
+            for v in adjacent[u]:
+                dv = dist[v]
+                if dv != du + 1 or body[v]:
+                    continue
+                if any(dist[w] == du for w in adjacent[v]):
+                    continue
+                dist[v] = UNREACHABLE
+                affected.append(v)
+                if len(affected) > budget:
+                    return False
+                queue.append((v, dv))
+        heap = []
+        for v in affected:
+            best = min(dist[w] for w in adjacent[v]) + 1
+            if best < UNREACHABLE:
+                dist[v] = best
+                heap.append((best, v))
+        heapq.heapify(heap)
+        return self.relax(heap, budget - len(affected))
+
+    def free(self, i, budget):
+        dist = self.dist
+        self.body[i] = 0
+        best = min(dist[w] for w in self.adjacent[i]) + 1
+        if best >= dist[i]:
+            return True
+        dist[i] = best
+        return self.relax([(best, i)], budget)
+
+    def observe(self, engine):
+        if (self.dist is None or engine.food != self.food or engine.ticks != self.ticks + 1
+                or (engine.width, engine.height) != (self.width, self.height)):
+            self.rebuild(engine)
+        else:
+            self.repairs += 1
+            width = self.width
+            budget = int(width * self.height * REPAIR_FRACTION)
+            head_x, head_y = engine.snake[0]
+            tail_x, tail_y = self.tail
+            if not (self.block(head_y * width + head_x, budget)
+                    and (self.tail in engine.snake_cells or self.free(tail_y * width + tail_x, budget))):
+                self.repairs_abandoned += 1
+                self.rebuild(engine)
+        self.ticks = engine.ticks
+        self.tail = engine.snake[-1]
+
+    def tail_reachable(self, engine, start):
+        snake = engine.snake
+        width = self.width
+        if engine.grow == 0 and (start % width, start // width) != engine.food:
+            if len(snake) == 1:
+                return True
+            target_x, target_y = snake[-2]
+            vacated_x, vacated_y = snake[-1]
+            vacated = vacated_y * width + vacated_x
+        else:
+            target_x, target_y = snake[-1]
+            vacated = -1
+        target = target_y * width + target_x
+        body = self.body
+        adjacent = self.adjacent
+        seen = {start}
+        heap = [(0, start)]
+        while heap:
+            for j in adjacent[heapq.heappop(heap)[1]]:
+                if j == target:
+                    return True
+                if j not in seen and (not body[j] or j == vacated):
+                    seen.add(j)
+                    heapq.heappush(heap, (abs(j % width - target_x) + abs(j // width - target_y), j))
+        return False
+
+    def space(self, start, limit):
+        body = self.body
+        adjacent = self.adjacent
+        seen = {start}
+        queue = deque([start])
+        while queue and len(seen) < limit:
+            for j in adjacent[queue.popleft()]:
+                if j not in seen and not body[j]:
+                    seen.add(j)
+                    queue.append(j)
+        return len(seen)
+
+    def choose(self, engine):
+        if not engine.alive or engine.food is None:
+            return engine.direction
+        self.observe(engine)
+        width = self.width
+        head_x, head_y = engine.snake[0]
+        options = []
+        for d in DIRECTIONS:
+            x, y = head_x + d[0], head_y + d[1]
+            if engine.can_turn(d) and 0 <= x < width and 0 <= y < self.height and not self.body[y * width + x]:
+                i = y * width + x
+                options.append((self.dist[i], d, i))
+        if not options:
+            return engine.direction
+        options.sort()
+        for dist, direction, i in options:
+            if dist < UNREACHABLE and self.tail_reachable(engine, i):
+                return direction
+        for dist, direction, i in reversed(options):
+            if dist >= UNREACHABLE and self.tail_reachable(engine, i):
+                return direction
+        limit = len(engine.snake) + 1
+        return max(options, key=lambda option: self.space(option[2], limit))[1]
+
+    def decide(self, engine):
+        start = time.perf_counter()
+        direction = self.choose(engine)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        self.decision_times.append(elapsed)
+        if self.history is not None:
+            self.history.append(elapsed)
+        self.decisions += 1
+        self.total_ms += elapsed
+        self.max_ms = max(self.max_ms, elapsed)
+        return direction
+
+    def stats(self):
+        stats = {
+            "decisions": self.decisions,
+            "decision_ms_mean": self.total_ms / self.decisions if self.decisions else 0.0,
+            "decision_ms_p99_trailing": percentile(self.decision_times, 99),
+            "decision_ms_max": self.max_ms,
+            "field_rebuilds": self.rebuilds,
+            "field_repairs": self.repairs,
+            "repairs_abandoned": self.repairs_abandoned,
+        }
+        if self.history is not None:
+            stats["decision_ms_p99"] = percentile(self.history, 99)
+        return stats
+
+def soak(width, height, speed_level, games, max_ticks, seed):
+    budget_ms = 1000.0 / speed_to_fps(speed_level)
+    results = []
+    for i in range(games):
+        engine = SnakeEngine(width, height, seed=seed + i)
+        pilot = Autopilot(keep_history=True)
+        while engine.alive and engine.ticks < max_ticks:
+            engine.step(pilot.decide(engine))
+        result = {
+            "seed": seed + i,
+            "score": engine.score,
+            "length": len(engine.snake),
+            "ticks": engine.ticks,
+            "death": "win" if engine.won else engine.death_cause or "timeout",
+        }
+        result.update(pilot.stats())
+        del result["decision_ms_p99_trailing"]
+        result["over_budget"] = pilot.max_ms > budget_ms
+        results.append(result)
+    return {"tick_budget_ms": budget_ms, "games": results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak-test the pathfinding autopilot headless.")
+    parser.add_argument("--width", type=int, default=SOAK_BOARD[0])
+    parser.add_argument("--height", type=int, default=SOAK_BOARD[1])
+    parser.add_argument("--speed", type=int, default=SOAK_SPEED, help="speed level whose tick budget decisions must fit in")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--max-ticks", type=int, default=SOAK_TICKS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(json.dumps(soak(args.width, args.height, args.speed, args.games, args.max_ticks, args.seed), indent=2))
+
+if __name__ == "__main__":
+    main()
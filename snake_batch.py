@@ -0,0 +1,107 @@
+import numpy as np
+
+from snake_engine import DIRECTIONS, RIGHT, FOOD_SCORE
+
+DX = np.array([d[0] for d in DIRECTIONS], dtype=np.int64)
+DY = np.array([d[1] for d in DIRECTIONS], dtype=np.int64)
+REVERSE = np.array([DIRECTIONS.index((-d[0], -d[1])) for d in DIRECTIONS], dtype=np.int64)
+START_DIRECTION = DIRECTIONS.index(RIGHT)
+FOOD_RETRIES = 4
+
+class BatchSnakeEnv:
+    def __init__(self, num_boards, width, height, seed=None):
+        self.num_boards = num_boards
+        self.width = max(1, width)
+        self.height = max(1, height)
+        self.cells = self.width * self.height
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(num_boards)
+
+        self.occupancy = np.zeros((num_boards, self.cells), dtype=bool)
+        self.body = np.zeros((num_boards, self.cells), dtype=np.int64)
+        self.head_ptr = np.zeros(num_boards, dtype=np.int64)
+        self.length = np.zeros(num_boards, dtype=np.int64)
+        self.heads = np.zeros(num_boards, dtype=np.int64)
+        self.directions = np.zeros(num_boards, dtype=np.int64)
+        self.food = np.zeros(num_boards, dtype=np.int64)
+        self.scores = np.zeros(num_boards, dtype=np.int64)
+        self.ticks = np.zeros(num_boards, dtype=np.int64)
+        self.reset()
+
+    def reset(self, mask=None):
+        boards = self.rows if mask is None else np.flatnonzero(mask)
+        if boards.size == 0:
+            return
+        start = (self.height // 2) * self.width + self.width // 2
+        self.occupancy[boards] = False
+        self.occupancy[boards, start] = True
+        self.body[boards, 0] = start
+        self.head_ptr[boards] = 0
+        self.length[boards] = 1
+        self.heads[boards] = start
+        self.directions[boards] = START_DIRECTION
+        self.scores[boards] = 0
+        self.ticks[boards] = 0
+        self.food[boards] = self.sample_food(boards)
+
+    def sample_food(self, boards):
+        food = np.full(boards.size, -1, dtype=np.int64)
+        pending = np.arange(boards.size)
+        for _ in range(FOOD_RETRIES):
+            if pending.size == 0:
+                return food
+            guess = self.rng.integers(0, self.cells, size=pending.size)
+            free = ~self.occupancy[boards[pending], guess]
+            food[pending[free]] = guess[free]
+            pending = pending[~free]
+        if pending.size:
+            keys = self.rng.random((pending.size, self.cells))
+            keys[self.occupancy[boards[pending]]] = -1.0
+            best = keys.argmax(axis=1)
+            full = keys[np.arange(pending.size), best] < 0
+            food[pending] = np.where(full, -1, best)
+        return food
+
+    def head_positions(self):
+        return self.heads % self.width, self.heads // self.width
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        turn = actions != REVERSE[self.directions]
+        self.directions = np.where(turn, actions, self.directions)
+        self.ticks += 1
+
+        x = self.heads % self.width + DX[self.directions]
+        y = self.heads // self.width + DY[self.directions]
+        wall = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        new_head = np.where(wall, 0, y * self.width + x)
+        hit_self = ~wall & self.occupancy[self.rows, new_head]
+        done = wall | hit_self
+        alive = np.flatnonzero(~done)
+
+        cell = new_head[alive]
+        eaten = np.zeros(self.num_boards, dtype=bool)
+        eaten[alive] = cell == self.food[alive]
+        ptr = (self.head_ptr[alive] + 1) % self.cells
+        self.head_ptr[alive] = ptr
+        self.body[alive, ptr] = cell
+        self.occupancy[alive, cell] = True
+        self.heads[alive] = cell
+
+        movers = alive[~eaten[alive]]
+        tail = self.body[movers, (self.head_ptr[movers] - self.length[movers]) % self.cells]
+        self.occupancy[movers, tail] = False
+
+        eaters = np.flatnonzero(eaten)
+        won = np.zeros(self.num_boards, dtype=bool)
+        if eaters.size:
+            self.length[eaters] += 1
+            self.scores[eaters] += FOOD_SCORE
+            food = self.sample_food(eaters)
+            self.food[eaters] = food
+            won[eaters] = food < 0
+            done |= won
+
+        scores = self.scores.copy()
+        self.reset(done)
+        return scores, eaten, done, won
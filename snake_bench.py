@@ -0,0 +1,254 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+from collections import deque
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from snake_engine import SnakeEngine, make_free_cells
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = "bench_baseline.json"
+DEFAULT_THRESHOLD = 0.15
+BENCH_REPEAT = 5
+TICK_LENGTHS = (1, 100, 1000, "near_full")
+NEAR_FULL = 0.95
+FOOD_OCCUPANCY = (0.0, 0.5, 0.9, 0.99)
+RESOLUTIONS = {
+    "640x480": (640, 480),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+TICK_SCREEN = (1920, 1080)
+RENDER_LENGTH = 100
+
+def load_game_module():
+    spec = importlib.util.spec_from_file_location("simple_snake", os.path.join(BENCH_DIR, "simple-snake.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def cycle_path(width, height):
+    path = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        xs = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        path.extend((x, y) for x in xs)
+    path.extend((0, y) for y in range(height - 1, 0, -1))
+    return path
+
+class CycleRunner:
+    def __init__(self, width, height):
+        self.path = cycle_path(width, height)
+        n = len(self.path)
+        self.directions = [(self.path[(i + 1) % n][0] - p[0], self.path[(i + 1) % n][1] - p[1]) for i, p in enumerate(self.path)]
+        self.head_index = 0
+
+    def place(self, engine, length, food_ahead=None):
+        n = len(self.path)
+        length = max(1, min(length, n - 1))
+        engine.snake = deque(reversed(self.path[:length]))
+        engine.snake_cells = set(engine.snake)
+        engine.free_cells = make_free_cells(engine.width, engine.height, engine.snake_cells)
+        engine.grow = 0
+        engine.alive = True
+        self.head_index = length - 1
+        engine.direction = self.directions[self.head_index]
+        engine.food = None if food_ahead is None else self.path[(self.head_index + food_ahead) % n]
+
+    def next_direction(self):
+        direction = self.directions[self.head_index]
+        self.head_index = (self.head_index + 1) % len(self.path)
+        return direction
+
+def best_of(func, repeat=BENCH_REPEAT):
+    return min(func() for _ in range(repeat))
+
+def metric(name, value, unit, better):
+    return {"name": name, "value": value, "unit": unit, "better": better}
+
+def snake_lengths(cells):
+    for length in TICK_LENGTHS:
+        if length == "near_full":
+            yield "near_full", int(cells * NEAR_FULL)
+        elif length < cells:
+            yield str(length), length
+
+def bench_engine_step(width, height, ticks):
+    engine = SnakeEngine(width, height, seed=0)
+    runner = CycleRunner(width, height)
+    results = []
+    for label, length in snake_lengths(width * height):
+        def run():
+            runner.place(engine, length)
+            start = time.perf_counter()
+            for _ in range(ticks):
+                engine.step(runner.next_direction())
+            return time.perf_counter() - start
+        results.append(metric(f"engine.step.len_{label}", ticks / best_of(run), "ticks/s", "higher"))
+    return results
+
+def bench_update_game(game, ticks):
+    game.resize_window(*TICK_SCREEN)
+    game.reset_game()
+    engine = game.engine
+    runner = CycleRunner(engine.width, engine.height)
+    results = []
+    for label, length in snake_lengths(engine.width * engine.height):
+        def run():
+            game.reset_game()
+            runner.place(engine, length)
+            start = time.perf_counter()
+            for _ in range(ticks):
+                game.pending_direction = runner.next_direction()
+                game.update_game()
+                game.dirty_cells.clear()
+            return time.perf_counter() - start
+        results.append(metric(f"update_game.len_{label}", ticks / best_of(run), "ticks/s", "higher"))
+    return results
+
+def bench_food(width, height, samples):
+    engine = SnakeEngine(width, height, seed=0)
+    runner = CycleRunner(width, height)
+    results = []
+    for occupancy in FOOD_OCCUPANCY:
+        runner.place(engine, int(width * height * occupancy))
+        def run():
+            start = time.perf_counter()
+            for _ in range(samples):
+                engine.random_food_position()
+            return time.perf_counter() - start
+        results.append(metric(f"random_food_position.occupancy_{int(occupancy * 100)}", best_of(run) / samples * 1e6, "us", "lower"))
+    return results
+
+def bench_render(game, frames):
+    results = []
+    for label, size in RESOLUTIONS.items():
+        game.resize_window(*size)
+        game.reset_game()
+        engine = game.engine
+        runner = CycleRunner(engine.width, engine.height)
+        length = min(RENDER_LENGTH, engine.width * engine.height // 2)
+
+        def run_full():
+            runner.place(engine, length, food_ahead=1)
+            start = time.perf_counter()
+            for _ in range(frames):
+                game.render_game_full()
+                pygame.display.flip()
+            return time.perf_counter() - start
+
+        def run_dirty():
+            game.reset_game()
+            runner.place(engine, length, food_ahead=frames + 1)
+            game.render_game_full()
+            start = time.perf_counter()
+            for _ in range(frames):
+                game.pending_direction = runner.next_direction()
+                game.update_game()
+                game.render_game()
+                if game.update_rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(game.update_rects)
+            return time.perf_counter() - start
+
+        results.append(metric(f"render_game.full.{label}", best_of(run_full) / frames * 1000, "ms", "lower"))
+        results.append(metric(f"render_game.dirty.{label}", best_of(run_dirty) / frames * 1000, "ms", "lower"))
+    return results
+
+def bench_draw_text(module, game, calls):
+    surface = game.screen
+
+    def run_cached():
+        start = time.perf_counter()
+        for _ in range(calls):
+            module.draw_text(surface, "Score: 1234", 20, module.TEXT_COLOR, 10, 10)
+        return time.perf_counter() - start
+
+    def run_uncached():
+        start = time.perf_counter()
+        for i in range(calls):
+            module.draw_text(surface, f"Score: {i}", 20, module.TEXT_COLOR, 10, 10)
+        return time.perf_counter() - start
+
+    return [
+        metric("draw_text.cached", calls / best_of(run_cached), "calls/s", "higher"),
+        metric("draw_text.uncached", calls / best_of(run_uncached), "calls/s", "higher"),
+    ]
+
+def run_benchmarks(quick=False):
+    scale = 10 if quick else 1
+    module = load_game_module()
+    game = module.SnakeGame()
+    width, height = TICK_SCREEN[0] // module.GRID_SIZE, TICK_SCREEN[1] // module.GRID_SIZE
+    metrics = []
+    metrics += bench_engine_step(width, height, 20000 // scale)
+    metrics += bench_update_game(game, 20000 // scale)
+    metrics += bench_food(width, height, 20000 // scale)
+    metrics += bench_render(game, 200 // scale)
+    metrics += bench_draw_text(module, game, 5000 // scale)
+    game.settings.close()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "metrics": metrics,
+    }
+
+def compare(results, baseline, threshold):
+    base = {m["name"]: m for m in baseline.get("metrics", [])}
+    thresholds = baseline.get("thresholds", {})
+    regressions = []
+    for m in results["metrics"]:
+        ref = base.get(m["name"])
+        if not ref or not ref["value"]:
+            continue
+        limit = thresholds.get(m["name"], threshold)
+        change = m["value"] / ref["value"] - 1.0
+        worse = -change if m["better"] == "higher" else change
+        status = "REGRESSION" if worse > limit else "ok"
+        print(f"{m['name']:<40}{ref['value']:>14.2f}{m['value']:>14.2f} {m['unit']:<8}{change:+8.1%}  {status}")
+        if status != "ok":
+            regressions.append(m["name"])
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the snake engine and renderer hot paths.")
+    parser.add_argument("--output", default="bench_results.json", help="where to write this run's results")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown as a fraction (default 0.15)")
+    parser.add_argument("--quick", action="store_true", help="run a tenth of the iterations")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.quick)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        for m in results["metrics"]:
+            print(f"{m['name']:<40}{m['value']:>14.2f} {m['unit']}")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
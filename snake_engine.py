@@ -0,0 +1,218 @@
+import random
+from collections import deque
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+EVENT_HEAD = "head"
+EVENT_TAIL = "tail"
+EVENT_EAT = "eat"
+EVENT_FOOD = "food"
+EVENT_DEATH = "death"
+EVENT_WIN = "win"
+
+DEATH_WALL = "wall"
+DEATH_SELF = "self"
+
+FOOD_SCORE = 10
+FREE_INDEX_LIMIT = 1 << 20
+SPARSE_SAMPLE_TRIES = 64
+
+def speed_to_fps(speed_level):
+    return int(6 + (speed_level - 1) * (16 / 9))
+
+def is_reverse(a, b):
+    return a[0] == -b[0] and a[1] == -b[1]
+
+class FreeCells:
+    def __init__(self, width, height, occupied=()):
+        self.width = width
+        self.height = height
+        self.cells = [(x, y) for y in range(height) for x in range(width) if (x, y) not in occupied]
+        self.index = {pos: i for i, pos in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, pos):
+        return pos in self.index
+
+    def add(self, pos):
+        if pos in self.index or not (0 <= pos[0] < self.width and 0 <= pos[1] < self.height):
+            return
+        self.index[pos] = len(self.cells)
+        self.cells.append(pos)
+
+    def remove(self, pos):
+        i = self.index.pop(pos, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def sample(self, rng=random):
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+class SparseFreeCells:
+    def __init__(self, width, height, occupied):
+        self.width = width
+        self.height = height
+        self.occupied = occupied
+
+    def __len__(self):
+        return self.width * self.height - len(self.occupied)
+
+    def __contains__(self, pos):
+        return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height and pos not in self.occupied
+
+    def add(self, pos):
+        pass
+
+    def remove(self, pos):
+        pass
+
+    def sample(self, rng=random):
+        if len(self) <= 0:
+            return None
+        for _ in range(SPARSE_SAMPLE_TRIES):
+            pos = (rng.randrange(self.width), rng.randrange(self.height))
+            if pos not in self.occupied:
+                return pos
+        start = rng.randrange(self.width * self.height)
+        for i in range(self.width * self.height):
+            y, x = divmod((start + i) % (self.width * self.height), self.width)
+            if (x, y) not in self.occupied:
+                return (x, y)
+        return None
+
+def make_free_cells(width, height, occupied):
+    if width * height > FREE_INDEX_LIMIT:
+        return SparseFreeCells(width, height, occupied)
+    return FreeCells(width, height, occupied)
+
+class SnakeEngine:
+    def __init__(self, width, height, seed=None, rng=None):
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.reset(width, height)
+
+    def reset(self, width=None, height=None, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        if width is not None:
+            self.width = max(1, width)
+        if height is not None:
+            self.height = max(1, height)
+        self.snake = deque([(self.width // 2, self.height // 2)])
+        self.snake_cells = set(self.snake)
+        self.free_cells = make_free_cells(self.width, self.height, self.snake_cells)
+        self.direction = RIGHT
+        self.food = self.random_food_position()
+        self.score = 0
+        self.grow = 0
+        self.ticks = 0
+        self.alive = True
+        self.won = False
+        self.death_cause = None
+
+    def resize(self, width, height):
+        self.width = max(1, width)
+        self.height = max(1, height)
+
+    def random_food_position(self):
+        if (self.free_cells.width, self.free_cells.height) != (self.width, self.height):
+            self.free_cells = make_free_cells(self.width, self.height, self.snake_cells)
+        return self.free_cells.sample(self.rng)
+
+    def can_turn(self, direction):
+        return not is_reverse(direction, self.direction)
+
+    def step(self, direction=None):
+        if not self.alive:
+            return []
+        if direction is not None and self.can_turn(direction):
+            self.direction = direction
+        self.ticks += 1
+        head_x, head_y = self.snake[0]
+        new_head = (head_x + self.direction[0], head_y + self.direction[1])
+
+        if not (0 <= new_head[0] < self.width and 0 <= new_head[1] < self.height):
+            return self.die(DEATH_WALL)
+        if new_head in self.snake_cells:
+            return self.die(DEATH_SELF)
+
+        events = [(EVENT_HEAD, new_head)]
+        self.snake.appendleft(new_head)
+        self.snake_cells.add(new_head)
+        self.free_cells.remove(new_head)
+        if new_head == self.food:
+            self.score += FOOD_SCORE
+            self.grow += 1
+            events.append((EVENT_EAT, new_head))
+            self.food = self.random_food_position()
+            if self.food is None:
+                self.alive = False
+                self.won = True
+                events.append((EVENT_WIN, None))
+            else:
+                events.append((EVENT_FOOD, self.food))
+        if self.grow > 0:
+            self.grow -= 1
+        else:
+            tail = self.snake.pop()
+            self.snake_cells.discard(tail)
+            self.free_cells.add(tail)
+            events.append((EVENT_TAIL, tail))
+        return events
+
+    def snapshot(self):
+        return {
+            "width": self.width,
+            "height": self.height,
+            "snake": list(self.snake),
+            "free_size": (self.free_cells.width, self.free_cells.height),
+            "free_cells": list(self.free_cells.cells) if isinstance(self.free_cells, FreeCells) else None,
+            "direction": self.direction,
+            "food": self.food,
+            "score": self.score,
+            "grow": self.grow,
+            "ticks": self.ticks,
+            "alive": self.alive,
+            "won": self.won,
+            "death_cause": self.death_cause,
+            "rng": self.rng.getstate(),
+        }
+
+    def restore(self, state):
+        self.width = state["width"]
+        self.height = state["height"]
+        self.snake = deque(tuple(pos) for pos in state["snake"])
+        self.snake_cells = set(self.snake)
+        if state["free_cells"] is None:
+            self.free_cells = SparseFreeCells(*state["free_size"], self.snake_cells)
+        else:
+            self.free_cells = FreeCells(0, 0)
+            self.free_cells.width, self.free_cells.height = state["free_size"]
+            self.free_cells.cells = [tuple(pos) for pos in state["free_cells"]]
+            self.free_cells.index = {pos: i for i, pos in enumerate(self.free_cells.cells)}
+        self.direction = tuple(state["direction"])
+        self.food = tuple(state["food"]) if state["food"] is not None else None
+        self.score = state["score"]
+        self.grow = state["grow"]
+        self.ticks = state["ticks"]
+        self.alive = state["alive"]
+        self.won = state["won"]
+        self.death_cause = state["death_cause"]
+        version, internal, gauss_next = state["rng"]
+        self.rng.setstate((version, tuple(internal), gauss_next))
+
+    def die(self, cause):
+        self.alive = False
+        self.death_cause = cause
+        return [(EVENT_DEATH, cause)]
@@ -0,0 +1,70 @@
+import csv
+import json
+import time
+from collections import deque
+
+PROFILE_WINDOW = 300
+PHASES = ("events", "handlers", "update", "render", "present", "sleep")
+TRACE_FIELDS = ("frame", "state", "render_call") + PHASES + ("total", "ticks", "snake_length")
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class FrameProfiler:
+    def __init__(self, window=PROFILE_WINDOW, trace_path=None):
+        self.frames = deque(maxlen=window)
+        self.frame_index = 0
+        self.current = None
+        self.last = 0.0
+        self.trace_file = None
+        self.trace_writer = None
+        if trace_path:
+            self.open_trace(trace_path)
+
+    def open_trace(self, path):
+        self.trace_file = open(path, "w", encoding="utf-8", newline="")
+        if path.endswith(".csv"):
+            self.trace_writer = csv.DictWriter(self.trace_file, fieldnames=TRACE_FIELDS)
+            self.trace_writer.writeheader()
+
+    def begin_frame(self):
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.current[phase] += (now - self.last) * 1000.0
+        self.last = now
+
+    def end_frame(self, state, render_call, ticks, snake_length):
+        frame = self.current
+        frame["total"] = sum(frame[phase] for phase in PHASES)
+        frame["frame"] = self.frame_index
+        frame["state"] = state
+        frame["render_call"] = render_call
+        frame["ticks"] = ticks
+        frame["snake_length"] = snake_length
+        self.frames.append(frame)
+        self.frame_index += 1
+        if self.trace_writer:
+            self.trace_writer.writerow(frame)
+        elif self.trace_file:
+            self.trace_file.write(json.dumps(frame) + "\n")
+
+    def summary(self):
+        totals = [f["total"] for f in self.frames]
+        count = len(self.frames) or 1
+        stats = {phase: sum(f[phase] for f in self.frames) / count for phase in PHASES}
+        stats["p50"] = percentile(totals, 50)
+        stats["p95"] = percentile(totals, 95)
+        stats["p99"] = percentile(totals, 99)
+        return stats
+
+    def close(self):
+        if self.trace_file:
+            self.trace_file.close()
+            self.trace_file = None
+            self.trace_writer = None
@@ -0,0 +1,244 @@
+import argparse
+import bisect
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from snake_engine import SnakeEngine, DIRECTIONS
+
+REPLAY_MAGIC = b"SNKR"
+REPLAY_VERSION = 2
+REPLAY_FILE = "last_replay.snr"
+CHECKPOINT_INTERVAL = 1000
+CHECKPOINT_CELL_RATIO = 64
+HEADER = struct.Struct("<4sBQHHBII")
+
+INPUT_RESIZE = len(DIRECTIONS)
+INPUT_BITS = 3
+
+def write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+def checkpoint_interval_for(width, height):
+    return max(CHECKPOINT_INTERVAL, width * height // CHECKPOINT_CELL_RATIO)
+
+def pack_checkpoint(input_index, direction, state):
+    cells = state["free_cells"]
+    indices = array("I")
+    if cells is not None:
+        width = state["free_size"][0]
+        indices = array("I", [y * width + x for x, y in cells])
+        if sys.byteorder == "big":
+            indices.byteswap()
+    meta = dict(state, free_cells=cells is not None)
+    out = bytearray()
+    header = json.dumps([input_index, direction, meta]).encode("utf-8")
+    write_varint(out, len(header))
+    out += header
+    out += indices.tobytes()
+    return zlib.compress(bytes(out), 1)
+
+def unpack_checkpoint(blob):
+    data = zlib.decompress(blob)
+    size, pos = read_varint(data, 0)
+    input_index, direction, state = json.loads(data[pos:pos + size])
+    if state["free_cells"]:
+        indices = array("I")
+        indices.frombytes(data[pos + size:])
+        if sys.byteorder == "big":
+            indices.byteswap()
+        width = state["free_size"][0]
+        state["free_cells"] = [(i % width, i // width) for i in indices]
+    else:
+        state["free_cells"] = None
+    return input_index, tuple(direction), state
+
+class Replay:
+    def __init__(self, seed, width, height, speed_level, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.speed_level = speed_level
+        self.checkpoint_interval = checkpoint_interval
+        self.ticks = 0
+        self.inputs = []
+        self.checkpoints = []
+
+    def encode(self):
+        out = bytearray(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.width, self.height,
+                                    self.speed_level, self.ticks, self.checkpoint_interval))
+        write_varint(out, len(self.inputs))
+        last_tick = 0
+        for tick, code, value in self.inputs:
+            write_varint(out, ((tick - last_tick) << INPUT_BITS) | code)
+            if code == INPUT_RESIZE:
+                write_varint(out, value[0])
+                write_varint(out, value[1])
+            last_tick = tick
+        write_varint(out, len(self.checkpoints))
+        for tick, blob in self.checkpoints:
+            write_varint(out, tick)
+            write_varint(out, len(blob))
+            out += blob
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        magic, version, seed, width, height, speed_level, ticks, interval = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version not in (1, REPLAY_VERSION):
+            raise ValueError("not a snake replay file")
+        replay = cls(seed, width, height, speed_level, interval)
+        replay.ticks = ticks
+        pos = HEADER.size
+        count, pos = read_varint(data, pos)
+        tick = 0
+        for _ in range(count):
+            packed, pos = read_varint(data, pos)
+            tick += packed >> INPUT_BITS
+            code = packed & ((1 << INPUT_BITS) - 1)
+            if code == INPUT_RESIZE:
+                w, pos = read_varint(data, pos)
+                h, pos = read_varint(data, pos)
+                replay.inputs.append((tick, code, (w, h)))
+            else:
+                replay.inputs.append((tick, code, DIRECTIONS[code]))
+        count, pos = read_varint(data, pos)
+        for _ in range(count):
+            tick, pos = read_varint(data, pos)
+            size, pos = read_varint(data, pos)
+            blob = data[pos:pos + size]
+            if version == 1:
+                input_index, direction, state = json.loads(zlib.decompress(blob))
+                blob = pack_checkpoint(input_index, direction, state)
+            replay.checkpoints.append((tick, blob))
+            pos += size
+        return replay
+
+    def checkpoint(self, i):
+        tick, blob = self.checkpoints[i]
+        return (tick,) + unpack_checkpoint(blob)
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.encode())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.decode(f.read())
+
+class ReplayRecorder:
+    def __init__(self, engine, seed, speed_level, checkpoint_interval=None):
+        if checkpoint_interval is None:
+            checkpoint_interval = checkpoint_interval_for(engine.width, engine.height)
+        self.replay = Replay(seed, engine.width, engine.height, speed_level, checkpoint_interval)
+        self.direction = engine.direction
+        self.size = (engine.width, engine.height)
+
+    def record(self, engine, direction):
+        tick = engine.ticks
+        replay = self.replay
+        size = (engine.width, engine.height)
+        if size != self.size:
+            replay.inputs.append((tick, INPUT_RESIZE, size))
+            self.size = size
+        if direction != self.direction:
+            replay.inputs.append((tick, DIRECTIONS.index(direction), direction))
+            self.direction = direction
+        if tick % replay.checkpoint_interval == 0:
+            replay.checkpoints.append((tick, pack_checkpoint(len(replay.inputs), self.direction, engine.snapshot())))
+
+    def finish(self, engine):
+        self.replay.ticks = engine.ticks
+        return self.replay
+
+class ReplayPlayer:
+    def __init__(self, replay, engine=None):
+        self.replay = replay
+        self.checkpoint_ticks = [cp[0] for cp in replay.checkpoints]
+        if engine is None:
+            self.engine = SnakeEngine(replay.width, replay.height, seed=replay.seed)
+        else:
+            self.engine = engine
+            engine.reset(replay.width, replay.height, seed=replay.seed)
+        self.input_index = 0
+        self.direction = self.engine.direction
+
+    @property
+    def done(self):
+        return not self.engine.alive or self.engine.ticks >= self.replay.ticks
+
+    def step(self):
+        engine = self.engine
+        inputs = self.replay.inputs
+        while self.input_index < len(inputs) and inputs[self.input_index][0] <= engine.ticks:
+            _, code, value = inputs[self.input_index]
+            if code == INPUT_RESIZE:
+                engine.resize(*value)
+            else:
+                self.direction = value
+            self.input_index += 1
+        return engine.step(self.direction)
+
+    def seek(self, tick):
+        i = bisect.bisect_right(self.checkpoint_ticks, tick) - 1
+        if i >= 0:
+            cp_tick, input_index, direction, state = self.replay.checkpoint(i)
+            if tick < self.engine.ticks or cp_tick > self.engine.ticks:
+                self.engine.restore(state)
+                self.input_index = input_index
+                self.direction = direction
+        elif tick < self.engine.ticks:
+            self.engine.reset(self.replay.width, self.replay.height, seed=self.replay.seed)
+            self.input_index = 0
+            self.direction = self.engine.direction
+        while self.engine.ticks < tick and not self.done:
+            self.step()
+
+    def run(self):
+        while not self.done:
+            self.step()
+        return self.engine
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play back a snake replay headless as fast as possible.")
+    parser.add_argument("path", nargs="?", default=REPLAY_FILE)
+    parser.add_argument("--seek", type=int, default=0, metavar="TICK", help="jump to this tick before playing")
+    args = parser.parse_args(argv)
+
+    player = ReplayPlayer(Replay.load(args.path))
+    player.seek(args.seek)
+    engine = player.run()
+    print(json.dumps({
+        "ticks": engine.ticks,
+        "recorded_ticks": player.replay.ticks,
+        "score": engine.score,
+        "length": len(engine.snake),
+        "death": "win" if engine.won else engine.death_cause,
+    }))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import heapq
+import os
+
+HIGHSCORE_FILE = "highscores.txt"
+HIGHSCORE_LOG = "highscores.log"
+MAX_NAME_LENGTH = 10
+MAX_HIGHSCORES = 10
+
+def rank_highscores(scores):
+    scores = sorted(scores, key=lambda s: s[1], reverse=True)
+    return scores[:MAX_HIGHSCORES]
+
+def parse_score_line(line):
+    parts = line.strip().split(",", 1)
+    if len(parts) != 2:
+        return None
+    name, score_str = parts
+    try:
+        return name, int(score_str)
+    except ValueError:
+        return None
+
+def atomic_write_text(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class HighScoreStore:
+    def __init__(self, index_path=HIGHSCORE_FILE, log_path=HIGHSCORE_LOG, limit=MAX_HIGHSCORES):
+        self.index_path = index_path
+        self.log_path = log_path
+        self.limit = limit
+        self.heap = []
+        self.seq = 0
+        self.log_offset = 0
+        self.ranked = None
+        self.load()
+
+    def load(self):
+        self.heap = []
+        self.seq = 0
+        self.log_offset = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("#log "):
+                        try:
+                            self.log_offset = int(line[5:])
+                        except ValueError:
+                            pass
+                        continue
+                    entry = parse_score_line(line)
+                    if entry:
+                        self.push(*entry)
+        if self.catch_up():
+            self.write_index()
+
+    def catch_up(self):
+        if not os.path.exists(self.log_path):
+            if self.log_offset:
+                self.log_offset = 0
+                return True
+            return False
+        size = os.path.getsize(self.log_path)
+        if size < self.log_offset:
+            self.log_offset = size
+            return True
+        if size == self.log_offset:
+            return False
+        with open(self.log_path, "rb") as f:
+            f.seek(self.log_offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8", "replace").splitlines():
+            entry = parse_score_line(line)
+            if entry:
+                self.push(*entry)
+        self.log_offset += end
+        return True
+
+    def push(self, name, score):
+        key = (score, -self.seq, name)
+        self.seq += 1
+        if len(self.heap) < self.limit:
+            heapq.heappush(self.heap, key)
+        elif key > self.heap[0]:
+            heapq.heapreplace(self.heap, key)
+        else:
+            return False
+        self.ranked = None
+        return True
+
+    def insert(self, name, score):
+        line = f"{name},{score}\n".encode("utf-8")
+        changed = self.catch_up()
+        with open(self.log_path, "ab") as f:
+            if f.tell() > self.log_offset:
+                f.truncate(self.log_offset)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.log_offset += len(line)
+        if self.push(name, score) or changed:
+            self.write_index()
+
+    def write_index(self):
+        lines = [f"#log {self.log_offset}\n"]
+        lines.extend(f"{n},{s}\n" for n, s in self.leaderboard())
+        atomic_write_text(self.index_path, "".join(lines))
+
+    def leaderboard(self):
+        if self.ranked is None:
+            self.ranked = [(name, score) for score, _, name in sorted(self.heap, reverse=True)]
+        return list(self.ranked)
+
+def clamp_name_to_letters(name):
+    return "".join([ch for ch in name if ch.isalpha()])[:MAX_NAME_LENGTH]
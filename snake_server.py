@@ -0,0 +1,381 @@
+import argparse
+import asyncio
+import heapq
+import json
+import random
+import struct
+import sys
+import time
+from collections import deque
+
+from snake_engine import DIRECTIONS, FOOD_SCORE, FreeCells, is_reverse
+from snake_profiler import percentile
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+DEFAULT_BOARD = (200, 200)
+DEFAULT_TICK_RATE = 15
+DEFAULT_FOOD = 64
+MAX_CLIENT_BUFFER = 1 << 20
+MAX_CLIENT_ID = 0xFFFF
+TICK_STATS_WINDOW = 1000
+
+FRAME = struct.Struct("<I")
+DELTA_HEADER = struct.Struct("<cIHHHH")
+HEAD = struct.Struct("<HHH")
+FOOD = struct.Struct("<HHH")
+ID = struct.Struct("<H")
+MSG_WELCOME = b"W"
+MSG_DELTA = b"D"
+
+class ServerSnake:
+    def __init__(self, sid, head, direction):
+        self.id = sid
+        self.body = deque([head])
+        self.direction = direction
+        self.pending = direction
+        self.grow = 0
+        self.score = 0
+
+class SharedBoard:
+    def __init__(self, width, height, food_count=DEFAULT_FOOD, seed=None):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.occupied = {}
+        self.free_cells = FreeCells(width, height)
+        self.snakes = {}
+        self.respawn = []
+        self.food = [None] * food_count
+        self.food_cells = {}
+        self.tick = 0
+        self.heads = []
+        self.tails = []
+        self.food_moves = []
+        self.deaths = []
+        for slot in range(food_count):
+            self.place_food(slot)
+
+    def place_food(self, slot):
+        pos = self.free_cells.sample(self.rng)
+        self.food[slot] = pos
+        if pos is not None:
+            self.free_cells.remove(pos)
+            self.food_cells[pos] = slot
+            self.food_moves.append((slot, pos))
+
+    def spawn(self, sid):
+        pos = self.free_cells.sample(self.rng)
+        if pos is None:
+            self.respawn.append(sid)
+            return None
+        snake = ServerSnake(sid, pos, self.rng.choice(DIRECTIONS))
+        self.snakes[sid] = snake
+        self.occupied[pos] = sid
+        self.free_cells.remove(pos)
+        self.heads.append((sid, pos))
+        return snake
+
+    def remove(self, sid):
+        snake = self.snakes.pop(sid, None)
+        if snake is None:
+            return
+        for pos in snake.body:
+            del self.occupied[pos]
+            self.free_cells.add(pos)
+        self.deaths.append(sid)
+
+    def leave(self, sid):
+        if sid in self.respawn:
+            self.respawn.remove(sid)
+        self.remove(sid)
+
+    def steer(self, sid, direction):
+        snake = self.snakes.get(sid)
+        if snake and not is_reverse(direction, snake.direction):
+            snake.pending = direction
+
+    def step(self):
+        self.tick += 1
+        respawn, self.respawn = self.respawn, []
+        for sid in respawn:
+            self.spawn(sid)
+
+        moves = {}
+        targets = {}
+        for sid, snake in self.snakes.items():
+            snake.direction = snake.pending
+            head_x, head_y = snake.body[0]
+            new_head = (head_x + snake.direction[0], head_y + snake.direction[1])
+            moves[sid] = new_head
+            targets[new_head] = targets.get(new_head, 0) + 1
+
+        dead = [sid for sid, pos in moves.items()
+                if not (0 <= pos[0] < self.width and 0 <= pos[1] < self.height)
+                or pos in self.occupied or targets[pos] > 1]
+        for sid in dead:
+            self.remove(sid)
+            self.respawn.append(sid)
+            del moves[sid]
+
+        for sid, new_head in moves.items():
+            snake = self.snakes[sid]
+            snake.body.appendleft(new_head)
+            self.occupied[new_head] = sid
+            self.free_cells.remove(new_head)
+            self.heads.append((sid, new_head))
+            slot = self.food_cells.pop(new_head, None)
+            if slot is not None:
+                snake.score += FOOD_SCORE
+                snake.grow += 1
+                self.place_food(slot)
+            if snake.grow > 0:
+                snake.grow -= 1
+            else:
+                tail = snake.body.pop()
+                del self.occupied[tail]
+                self.free_cells.add(tail)
+                self.tails.append(sid)
+
+    def encode_delta(self):
+        out = bytearray(DELTA_HEADER.pack(MSG_DELTA, self.tick, len(self.heads), len(self.tails),
+                                          len(self.food_moves), len(self.deaths)))
+        for sid, (x, y) in self.heads:
+            out += HEAD.pack(sid, x, y)
+        for sid in self.tails:
+            out += ID.pack(sid)
+        for slot, (x, y) in self.food_moves:
+            out += FOOD.pack(slot, x, y)
+        for sid in self.deaths:
+            out += ID.pack(sid)
+        self.heads = []
+        self.tails = []
+        self.food_moves = []
+        self.deaths = []
+        return frame(bytes(out))
+
+    def encode_welcome(self, sid):
+        state = {
+            "id": sid,
+            "tick": self.tick,
+            "width": self.width,
+            "height": self.height,
+            "snakes": {str(s.id): list(s.body) for s in self.snakes.values()},
+            "food": self.food,
+        }
+        return frame(MSG_WELCOME + json.dumps(state, separators=(",", ":")).encode("utf-8"))
+
+def frame(payload):
+    return FRAME.pack(len(payload)) + payload
+
+def board_digest(snakes, food):
+    return hash((tuple(sorted((sid, tuple(body)) for sid, body in snakes.items())), tuple(food)))
+
+class BoardMirror:
+    def __init__(self, welcome):
+        self.id = welcome["id"]
+        self.tick = welcome["tick"]
+        self.snakes = {int(sid): deque(tuple(p) for p in body) for sid, body in welcome["snakes"].items()}
+        self.food = [tuple(p) if p else None for p in welcome["food"]]
+
+    def apply(self, payload):
+        _, tick, heads, tails, foods, deaths = DELTA_HEADER.unpack_from(payload)
+        pos = DELTA_HEADER.size
+        for _ in range(heads):
+            sid, x, y = HEAD.unpack_from(payload, pos)
+            self.snakes.setdefault(sid, deque()).appendleft((x, y))
+            pos += HEAD.size
+        for _ in range(tails):
+            (sid,) = ID.unpack_from(payload, pos)
+            self.snakes[sid].pop()
+            pos += ID.size
+        for _ in range(foods):
+            slot, x, y = FOOD.unpack_from(payload, pos)
+            self.food[slot] = (x, y)
+            pos += FOOD.size
+        for _ in range(deaths):
+            (sid,) = ID.unpack_from(payload, pos)
+            self.snakes.pop(sid, None)
+            pos += ID.size
+        self.tick = tick
+
+class SnakeServer:
+    def __init__(self, width, height, tick_rate=DEFAULT_TICK_RATE, food_count=DEFAULT_FOOD, seed=None,
+                 stats_window=TICK_STATS_WINDOW):
+        self.board = SharedBoard(width, height, food_count, seed)
+        self.tick_rate = tick_rate
+        self.clients = {}
+        self.joining = {}
+        self.next_id = 1
+        self.free_ids = []
+        self.released = []
+        self.tick_times = deque(maxlen=stats_window)
+        self.tick_lateness = deque(maxlen=stats_window)
+        self.digests = None
+        self.running = False
+
+    def allocate_id(self):
+        if self.free_ids:
+            return heapq.heappop(self.free_ids)
+        if self.next_id > MAX_CLIENT_ID:
+            return None
+        self.next_id += 1
+        return self.next_id - 1
+
+    async def handle_client(self, reader, writer):
+        sid = self.allocate_id()
+        if sid is None:
+            writer.close()
+            return
+        self.board.spawn(sid)
+        self.joining[sid] = writer
+        try:
+            while True:
+                data = await reader.read(64)
+                if not data:
+                    break
+                code = data[-1]
+                if code < len(DIRECTIONS):
+                    self.board.steer(sid, DIRECTIONS[code])
+        except ConnectionError:
+            pass
+        finally:
+            self.drop(sid)
+
+    def drop(self, sid):
+        writer = self.clients.pop(sid, None) or self.joining.pop(sid, None)
+        if writer is not None:
+            self.board.leave(sid)
+            self.released.append(sid)
+            writer.close()
+
+    def welcome(self):
+        for sid, writer in self.joining.items():
+            writer.write(self.board.encode_welcome(sid))
+            self.clients[sid] = writer
+        self.joining = {}
+
+    def broadcast(self, data):
+        for sid, writer in list(self.clients.items()):
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                self.drop(sid)
+            else:
+                writer.write(data)
+
+    async def tick_loop(self):
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time() + interval
+        self.running = True
+        while self.running:
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            self.tick_lateness.append((loop.time() - next_tick) * 1000.0)
+            start = time.perf_counter()
+            self.board.step()
+            released, self.released = self.released, []
+            data = self.board.encode_delta()
+            if self.digests is not None:
+                self.digests[self.board.tick] = board_digest(
+                    {sid: snake.body for sid, snake in self.board.snakes.items()}, self.board.food)
+            self.broadcast(data)
+            self.welcome()
+            for sid in released:
+                heapq.heappush(self.free_ids, sid)
+            self.tick_times.append((time.perf_counter() - start) * 1000.0)
+            next_tick += interval
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await self.tick_loop()
+
+async def read_frame(reader):
+    (size,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return await reader.readexactly(size)
+
+async def simulated_client(host, port, duration, tick_rate, seed, stats):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    received = 0
+    payload = await read_frame(reader)
+    received += FRAME.size + len(payload)
+    mirror = BoardMirror(json.loads(payload[1:]))
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    try:
+        while time.perf_counter() < deadline:
+            payload = await asyncio.wait_for(read_frame(reader), timeout=max(1.0, 10.0 / tick_rate))
+            received += FRAME.size + len(payload)
+            mirror.apply(payload)
+            if rng.random() < 0.3:
+                writer.write(bytes([rng.randrange(len(DIRECTIONS))]))
+    finally:
+        elapsed = time.perf_counter() - start
+        writer.close()
+    stats.append({"bytes": received, "seconds": elapsed, "tick": mirror.tick,
+                  "digest": board_digest(mirror.snakes, mirror.food)})
+
+async def run_loadtest(clients, duration, width, height, tick_rate, food_count, seed):
+    server = SnakeServer(width, height, tick_rate, food_count, seed, stats_window=None)
+    server.digests = {}
+    listener = await asyncio.start_server(server.handle_client, DEFAULT_HOST, 0)
+    port = listener.sockets[0].getsockname()[1]
+    ticker = asyncio.create_task(server.tick_loop())
+    stats = []
+    await asyncio.gather(*(simulated_client(DEFAULT_HOST, port, duration, tick_rate, seed + i, stats) for i in range(clients)))
+    server.running = False
+    await ticker
+    listener.close()
+    await listener.wait_closed()
+
+    tick_times = server.tick_times
+    lateness = server.tick_lateness
+    rates = [s["bytes"] / s["seconds"] for s in stats if s["seconds"] > 0]
+    mismatches = sum(1 for s in stats if server.digests.get(s["tick"]) != s["digest"])
+    return {
+        "clients": clients,
+        "ticks": len(tick_times),
+        "tick_rate": tick_rate,
+        "tick_ms_p50": percentile(tick_times, 50),
+        "tick_ms_p99": percentile(tick_times, 99),
+        "tick_ms_max": max(tick_times, default=0.0),
+        "tick_late_ms_p99": percentile(lateness, 99),
+        "bytes_per_client_per_s": sum(rates) / len(rates) if rates else 0.0,
+        "bytes_per_client_per_tick": sum(rates) / len(rates) / tick_rate if rates else 0.0,
+        "mirror_mismatches": mismatches,
+    }
+
+def parse_board(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Authoritative multiplayer snake server.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run the server")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    load = sub.add_parser("loadtest", help="run the server with simulated loopback clients")
+    load.add_argument("--clients", type=int, default=100)
+    load.add_argument("--duration", type=float, default=10.0, help="seconds each client stays connected")
+    for p in (serve, load):
+        p.add_argument("--board", type=parse_board, default=DEFAULT_BOARD, metavar="WxH")
+        p.add_argument("--tick-rate", type=int, default=DEFAULT_TICK_RATE)
+        p.add_argument("--food", type=int, default=DEFAULT_FOOD)
+        p.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    width, height = args.board
+    if args.command == "serve":
+        server = SnakeServer(width, height, args.tick_rate, args.food, args.seed)
+        try:
+            asyncio.run(server.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        result = asyncio.run(run_loadtest(args.clients, args.duration, width, height, args.tick_rate, args.food, args.seed))
+        print(json.dumps(result, indent=2))
+        return 1 if result["mirror_mismatches"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from snake_engine import SnakeEngine, DIRECTIONS, speed_to_fps
+from snake_scores import HighScoreStore, clamp_name_to_letters, rank_highscores
+from snake_autopilot import Autopilot
+
+DEFAULT_GRID_WIDTH = 32
+DEFAULT_GRID_HEIGHT = 24
+DEFAULT_MAX_TICKS = 100000
+DEATH_TIMEOUT = "timeout"
+
+def random_policy(engine, rng):
+    return rng.choice(DIRECTIONS)
+
+def is_safe(engine, direction):
+    x = engine.snake[0][0] + direction[0]
+    y = engine.snake[0][1] + direction[1]
+    return 0 <= x < engine.width and 0 <= y < engine.height and (x, y) not in engine.snake_cells
+
+def greedy_policy(engine, rng):
+    head_x, head_y = engine.snake[0]
+    food_x, food_y = engine.food
+    options = [d for d in DIRECTIONS if engine.can_turn(d) and is_safe(engine, d)]
+    if not options:
+        return engine.direction
+    rng.shuffle(options)
+    return min(options, key=lambda d: abs(head_x + d[0] - food_x) + abs(head_y + d[1] - food_y))
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+STATEFUL_POLICIES = {
+    "autopilot": partial(Autopilot, keep_history=True),
+}
+
+def run_game(job):
+    seed, policy_name, width, height, max_ticks = job
+    engine = SnakeEngine(width, height, seed=seed)
+    if policy_name in STATEFUL_POLICIES:
+        policy = STATEFUL_POLICIES[policy_name]()
+    else:
+        policy = POLICIES[policy_name]
+    rng = random.Random(f"policy-{seed}")
+    while engine.alive and engine.ticks < max_ticks:
+        engine.step(policy(engine, rng))
+    if engine.won:
+        cause = "win"
+    elif engine.alive:
+        cause = DEATH_TIMEOUT
+    else:
+        cause = engine.death_cause
+    result = {
+        "seed": seed,
+        "score": engine.score,
+        "length": len(engine.snake),
+        "ticks": engine.ticks,
+        "death": cause,
+    }
+    if hasattr(policy, "stats"):
+        result.update(policy.stats())
+        result.pop("decision_ms_p99_trailing", None)
+    return result
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summarize(results, speed_level, name):
+    scores = [r["score"] for r in results]
+    ticks = [r["ticks"] for r in results]
+    fps = speed_to_fps(speed_level)
+    summary = {
+        "games": len(results),
+        "speed_level": speed_level,
+        "score_mean": statistics.mean(scores),
+        "score_median": statistics.median(scores),
+        "score_p90": percentile(scores, 90),
+        "score_max": max(scores),
+        "length_mean": statistics.mean(r["length"] for r in results),
+        "ticks_mean": statistics.mean(ticks),
+        "seconds_mean": statistics.mean(ticks) / fps,
+        "deaths": dict(Counter(r["death"] for r in results)),
+        "highscores": rank_highscores([(name, s) for s in scores]),
+    }
+    if "decision_ms_max" in results[0]:
+        summary["decision_ms_mean"] = statistics.mean(r["decision_ms_mean"] for r in results)
+        summary["decision_ms_p99_max"] = max(r["decision_ms_p99"] for r in results)
+        summary["decision_ms_max"] = max(r["decision_ms_max"] for r in results)
+    return summary
+
+def simulate(games, workers, policy, width, height, seed, max_ticks, on_result=None):
+    jobs = [(seed + i, policy, width, height, max_ticks) for i in range(games)]
+    workers = workers or os.cpu_count() or 1
+    results = []
+    chunksize = max(1, games // (workers * 16))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(run_game, jobs, chunksize=chunksize):
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless snake games on a process pool.")
+    parser.add_argument("--simulate", type=int, default=100, metavar="N", help="number of games to play")
+    parser.add_argument("--workers", type=int, default=None, metavar="K", help="worker processes (default: CPU count)")
+    parser.add_argument("--policy", choices=sorted(list(POLICIES) + list(STATEFUL_POLICIES)), default="greedy")
+    parser.add_argument("--speed", type=int, default=5, choices=range(1, 11), metavar="1-10", help="speed_level used to convert ticks to seconds")
+    parser.add_argument("--width", type=int, default=DEFAULT_GRID_WIDTH, help="board width in cells")
+    parser.add_argument("--height", type=int, default=DEFAULT_GRID_HEIGHT, help="board height in cells")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS)
+    parser.add_argument("--stream", action="store_true", help="print each game result as a JSON line")
+    parser.add_argument("--save-highscores", action="store_true", help="record every score in the high-score log")
+    args = parser.parse_args(argv)
+
+    name = clamp_name_to_letters(args.policy) or "Bot"
+    store = HighScoreStore() if args.save_highscores else None
+
+    def on_result(result):
+        if args.stream:
+            print(json.dumps(result), flush=True)
+        if store:
+            store.insert(name, result["score"])
+
+    results = simulate(args.simulate, args.workers, args.policy, args.width, args.height, args.seed, args.max_ticks, on_result)
+    if results:
+        json.dump(summarize(results, args.speed, name), sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
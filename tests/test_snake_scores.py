@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake_scores import HighScoreStore
+
+def make_store(tmp_path):
+    return HighScoreStore(str(tmp_path / "highscores.txt"), str(tmp_path / "highscores.log"))
+
+def test_insert_ranks_and_survives_reload(tmp_path):
+    store = make_store(tmp_path)
+    for name, score in (("Ann", 30), ("Bob", 50), ("Cid", 40)):
+        store.insert(name, score)
+    assert store.leaderboard() == [("Bob", 50), ("Cid", 40), ("Ann", 30)]
+    assert make_store(tmp_path).leaderboard() == store.leaderboard()
+
+def test_torn_trailing_line_is_dropped(tmp_path):
+    store = make_store(tmp_path)
+    store.insert("Ann", 30)
+    with open(tmp_path / "highscores.log", "ab") as f:
+        f.write(b"Bo")
+    store = make_store(tmp_path)
+    store.insert("Cid", 40)
+    os.remove(tmp_path / "highscores.txt")
+    assert make_store(tmp_path).leaderboard() == [("Cid", 40), ("Ann", 30)]
+
+def test_missing_log_restarts_at_offset_zero(tmp_path):
+    store = make_store(tmp_path)
+    for name, score in (("Ann", 30), ("Bob", 20), ("Cid", 40)):
+        store.insert(name, score)
+    os.remove(tmp_path / "highscores.log")
+    store = make_store(tmp_path)
+    store.insert("Dan", 50)
+    assert os.path.getsize(tmp_path / "highscores.log") == len(b"Dan,50\n")
+    os.remove(tmp_path / "highscores.txt")
+    assert make_store(tmp_path).leaderboard() == [("Dan", 50)]
+
+def test_old_index_without_header(tmp_path):
+    (tmp_path / "highscores.txt").write_text("Ann,30\nBob,50\n", encoding="utf-8")
+    store = make_store(tmp_path)
+    assert store.leaderboard() == [("Bob", 50), ("Ann", 30)]
+    store.insert("Cid", 40)
+    store = make_store(tmp_path)
+    assert store.leaderboard() == [("Bob", 50), ("Cid", 40), ("Ann", 30)]
+    with open(tmp_path / "highscores.txt", encoding="utf-8") as f:
+        assert f.readline() == "#log 7\n"